@@ -1,16 +1,186 @@
+import hashlib
+import json
+import os
+import signal
+import sys
+import tempfile
 from sys import argv
 
+CHUNK_SIZE = 1 << 16
+STATE_SUFFIX = ".wcstate"
+# Bytes before the checkpoint offset hashed to detect a replaced file
+FINGERPRINT_SIZE = 1 << 12
+
+# Counts for the file currently being scanned, reported on SIGUSR1/SIGINFO
+_progress = {"counts": None}
+
+
+def _count_chunk(chunk, counts):
+    """Add the counts for `chunk` to `counts` (a state dict, updated in place).
+
+    `in_word` and `last_byte` carry across chunk boundaries so that a word or
+    line split between two reads is only counted once.
+    """
+    if not chunk:
+        return counts
+    words = len(chunk.split())
+    if counts["in_word"] and not chunk[:1].isspace():
+        words -= 1
+    counts["newlines"] += chunk.count(b"\n")
+    counts["words"] += words
+    counts["chars"] += len(chunk)
+    counts["in_word"] = not chunk[-1:].isspace()
+    counts["last_byte"] = chunk[-1]
+    return counts
+
+
+def _empty_counts():
+    return {"newlines": 0, "words": 0, "chars": 0, "in_word": False, "last_byte": None}
+
+
+def _result(counts):
+    # A trailing line without a newline still counts as a line
+    lines = counts["newlines"]
+    if counts["last_byte"] is not None and counts["last_byte"] != ord("\n"):
+        lines += 1
+    return lines, counts["words"], counts["chars"]
+
+
+def _scan(f, counts):
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            return counts
+        _count_chunk(chunk, counts)
+
+
+def _fingerprint(f, offset):
+    start = max(0, offset - FINGERPRINT_SIZE)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _report_progress(signum, frame):
+    if _progress["counts"] is not None:
+        print(_result(_progress["counts"]), file=sys.stderr)
+
+
+def _install_progress_handler():
+    # SIGINFO is BSD/macOS only; SIGUSR1 is the Linux equivalent
+    for name in ("SIGINFO", "SIGUSR1"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), _report_progress)
+
 
 def wc(file):
+    counts = _empty_counts()
+    _progress["counts"] = counts
+    with open(file, "rb") as f:
+        _scan(f, counts)
+    return _result(counts)
+
+
+def _is_count(value):
+    # bool is a subclass of int, but never a valid count
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _valid_state(state):
+    if not isinstance(state, dict):
+        return False
+    counts = state.get("counts")
+    if not isinstance(counts, dict) or set(counts) != set(_empty_counts()):
+        return False
+    last_byte = counts["last_byte"]
+    return (
+        all(_is_count(state.get(key)) for key in ("dev", "inode", "offset"))
+        and isinstance(state.get("fingerprint"), str)
+        and all(_is_count(counts[key]) for key in ("newlines", "words", "chars"))
+        and isinstance(counts["in_word"], bool)
+        and (last_byte is None or (_is_count(last_byte) and last_byte <= 255))
+        and state["offset"] == counts["chars"]
+    )
+
+
+def load_state(state_file):
+    """Return the checkpoint in `state_file`, or None if missing or malformed."""
+    try:
+        with open(state_file) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if _valid_state(state) else None
+
+
+def save_state(state_file, state):
+    """Atomically write `state` to `state_file`, warning on stderr on failure."""
+    tmp_file = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=os.path.dirname(state_file) or ".",
+            prefix=os.path.basename(state_file) + ".",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            tmp_file = f.name
+            json.dump(state, f)
+        os.replace(tmp_file, state_file)
+    except OSError as e:
+        print(f"wc.py: could not save checkpoint {state_file}: {e}", file=sys.stderr)
+        if tmp_file is not None and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def wc_incremental(file, state_file=None):
+    """Count `file`, resuming from the checkpoint in `state_file`.
+
+    Only bytes appended since the last run are read. If the file was replaced
+    or truncated (different inode, smaller than the checkpoint, or the bytes
+    just before the checkpoint changed), it is rescanned from the start.
+    """
+    if state_file is None:
+        state_file = file + STATE_SUFFIX
+    state = load_state(state_file)
     with open(file, "rb") as f:
-        lines = f.readlines()
-        words = sum(len(line.split()) for line in lines)
-        chars = sum(len(line) for line in lines)
-    return len(lines), words, chars
+        st = os.fstat(f.fileno())
+        if (
+            state is None
+            or state["dev"] != st.st_dev
+            or state["inode"] != st.st_ino
+            or state["offset"] > st.st_size
+            or state["fingerprint"] != _fingerprint(f, state["offset"])
+        ):
+            counts = _empty_counts()
+            f.seek(0)
+        else:
+            counts = state["counts"]
+            f.seek(state["offset"])
+        _progress["counts"] = counts
+        _scan(f, counts)
+        fingerprint = _fingerprint(f, counts["chars"])
+    save_state(
+        state_file,
+        {
+            "dev": st.st_dev,
+            "inode": st.st_ino,
+            "offset": counts["chars"],
+            "counts": counts,
+            "fingerprint": fingerprint,
+        },
+    )
+    return _result(counts)
 
 
 if __name__ == "__main__":
-    if len(argv) < 2:
-        print("Usage: wc.py <file>")
+    args = argv[1:]
+    incremental = "--incremental" in args
+    files = [arg for arg in args if arg != "--incremental"]
+    if len(files) != 1:
+        print("Usage: wc.py [--incremental] <file>")
     else:
-        print(wc(argv[1]))
+        _install_progress_handler()
+        if incremental:
+            print(wc_incremental(files[0]))
+        else:
+            print(wc(files[0]))
@@ -0,0 +1,148 @@
+import io
+import json
+import os
+import signal
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+import wc as wc_module
+from wc import CHUNK_SIZE, FINGERPRINT_SIZE, wc, wc_incremental
+
+test_file_path = os.path.join(os.path.dirname(__file__), "test.txt")
+
+
+def wc_readlines(file):
+    # Reference implementation: count everything in memory at once
+    with open(file, "rb") as f:
+        lines = f.readlines()
+    return (
+        len(lines),
+        sum(len(line.split()) for line in lines),
+        sum(len(line) for line in lines),
+    )
+
+
+class TestWc(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp_dir.name, "app.log")
+        self.state = self.log + ".wcstate"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, data, mode="ab"):
+        with open(self.log, mode) as f:
+            f.write(data)
+
+    def test_matches_readlines(self):
+        self.assertEqual(wc(test_file_path), wc_readlines(test_file_path))
+
+    def test_word_split_across_chunks(self):
+        self.write(b" " * (CHUNK_SIZE - 2) + b"word\nlast")
+        self.assertEqual(wc(self.log), wc_readlines(self.log))
+
+    def test_incremental_append(self):
+        self.write(b"one two\nthr")
+        self.assertEqual(wc_incremental(self.log), wc_readlines(self.log))
+        self.write(b"ee four\nfive")
+        self.assertEqual(wc_incremental(self.log), wc_readlines(self.log))
+        self.assertEqual(wc_incremental(self.log), (3, 5, 23))
+
+    def test_incremental_only_reads_appended_bytes(self):
+        prefix = b"word\n" * (FINGERPRINT_SIZE // 5 + 1)
+        self.write(prefix)
+        wc_incremental(self.log)
+        # Blank out the first word outside the fingerprinted window; a resumed
+        # run never reads it, so the old count must survive
+        self.write(b"    ", mode="r+b")
+        self.write(b"more\n")
+        lines = len(prefix) // 5 + 1
+        self.assertEqual(wc_incremental(self.log), (lines, lines, len(prefix) + 5))
+
+    def test_incremental_truncated(self):
+        self.write(b"one two three\n")
+        wc_incremental(self.log)
+        self.write(b"four\n", mode="wb")
+        self.assertEqual(wc_incremental(self.log), (1, 1, 5))
+
+    def test_incremental_rotated(self):
+        self.write(b"one two three\n")
+        wc_incremental(self.log)
+        os.rename(self.log, self.log + ".1")
+        self.write(b"four five six seven\n")
+        self.assertEqual(wc_incremental(self.log), (1, 4, 20))
+
+    def test_incremental_recreated_same_inode(self):
+        self.write(b"one two three\n")
+        wc_incremental(self.log)
+        inode = os.stat(self.log).st_ino
+        # Rewrite in place so the inode is guaranteed to be reused
+        self.write(b"x y z w v u t s\n", mode="r+b")
+        self.assertEqual(os.stat(self.log).st_ino, inode)
+        self.assertEqual(wc_incremental(self.log), (1, 8, 16))
+
+    def test_incremental_truncated_and_regrown(self):
+        self.write(b"one two three\n")
+        wc_incremental(self.log)
+        self.write(b"four five six seven words\n", mode="wb")
+        self.assertEqual(wc_incremental(self.log), (1, 5, 26))
+
+    def test_incremental_malformed_state(self):
+        self.write(b"one two three\n")
+        wc_incremental(self.log)
+        with open(self.state) as f:
+            state = json.load(f)
+        missing_key = dict(state, counts=dict(state["counts"]))
+        del missing_key["counts"]["in_word"]
+
+        def with_counts(**counts):
+            return dict(state, counts=dict(state["counts"], **counts))
+
+        malformed = [
+            [],
+            {"dev": state["dev"], "inode": state["inode"], "offset": 14},
+            missing_key,
+            dict(state, offset=state["offset"] - 1),
+            dict(state, dev=True),
+            dict(state, inode=False),
+            with_counts(newlines="x"),
+            with_counts(words=-1),
+            with_counts(newlines=True),
+            with_counts(last_byte="a", in_word="yes"),
+            with_counts(in_word=1),
+            with_counts(last_byte=256),
+        ]
+        for bad_state in malformed:
+            with self.subTest(state=bad_state):
+                with open(self.state, "w") as f:
+                    json.dump(bad_state, f)
+                self.assertEqual(wc_incremental(self.log), (1, 3, 14))
+
+    def test_incremental_state_not_writable(self):
+        self.write(b"one two three\n")
+        # A directory in the way makes the final rename fail
+        os.mkdir(self.state)
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            self.assertEqual(wc_incremental(self.log), (1, 3, 14))
+        self.assertIn("could not save checkpoint", stderr.getvalue())
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ["app.log", "app.log.wcstate"])
+
+    @unittest.skipUnless(hasattr(signal, "SIGUSR1"), "requires SIGUSR1")
+    def test_progress_signal(self):
+        previous = signal.getsignal(signal.SIGUSR1)
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        wc_module._install_progress_handler()
+        counts = wc_module._count_chunk(b"one two\nthr", wc_module._empty_counts())
+        wc_module._progress["counts"] = counts
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            os.kill(os.getpid(), signal.SIGUSR1)
+        self.assertEqual(stderr.getvalue(), "(2, 3, 11)\n")
+
+
+if __name__ == "__main__":
+    unittest.main()